@@ -3,10 +3,13 @@ from tkinter import filedialog, messagebox, simpledialog
 from tkinter import ttk
 import pandas as pd
 import numpy as np
-from datetime import datetime, time, timedelta
+from datetime import datetime, date, time
 from scipy.stats import mode  # for mode calculation
 import sqlite3
+import xlsxwriter
 import logging
+import math
+from concurrent.futures import ThreadPoolExecutor
 
 # PDF generation
 from reportlab.lib.pagesizes import letter
@@ -24,6 +27,13 @@ import matplotlib.pyplot as plt
 OCTAVE_BANDS_Z = [
     16, 31.5, 63, 125, 250, 500, 1000, 2000, 4000, 8000, 16000
 ]
+
+# Lden/Ldn evening (+5 dB) and night (+10 dB) penalties as energy factors
+EVENING_PENALTY = 10 ** 0.5
+NIGHT_PENALTY = 10 ** 1.0
+
+# Upper bound on samples drawn in the full-data time series plot
+MAX_PLOT_POINTS = 20000
 
 # ------------------ Logging Setup ------------------
 logging.basicConfig(
@@ -35,45 +45,58 @@ logging.info("Acoustic Processor started.")
 
 # ------------------ Helper Functions ------------------
 
-def nth_highest(series, n):
-    series = series.dropna().sort_values(ascending=False)
-    return series.iloc[n - 1] if len(series) >= n else None
+def nth_highest(values, n):
+    a = np.asarray(values, dtype=np.float64)
+    a = a[~np.isnan(a)]
+    if a.size < n:
+        return None
+    return float(np.partition(a, -n)[-n])
 
-def nth_lowest(series, n):
-    series = series.dropna().sort_values()
-    return series.iloc[n - 1] if len(series) >= n else None
+def nth_lowest(values, n):
+    a = np.asarray(values, dtype=np.float64)
+    a = a[~np.isnan(a)]
+    if a.size < n:
+        return None
+    return float(np.partition(a, n - 1)[n - 1])
 
-def parse_date(x):
-    # Try mm/dd/yyyy format first (e.g., "2/24/2023")
-    try:
-        return pd.to_datetime(x, format="%m/%d/%Y")
-    except Exception:
-        pass
-    # Then try ISO8601 (yyyy-mm-dd)
+def array_mode(values):
+    """Most frequent value, taking the smallest on ties like Series.mode()."""
+    counts = pd.Series(values).value_counts()
+    return counts.index[counts.values == counts.values[0]].min()
+
+def read_input_file(path):
+    """Read a survey workbook, using the faster calamine engine when it is installed."""
     try:
-        return pd.to_datetime(x, format="%Y-%m-%d")
-    except Exception:
-        return pd.NaT
+        return pd.read_excel(path, engine="calamine")
+    except (ImportError, ValueError):
+        # python-calamine missing, or a pandas version without the engine
+        return pd.read_excel(path)
+
+# Survey exports write dates either as mm/dd/yyyy or ISO; the format that
+# matched most rows last time is tried first
+DATE_FORMATS = ("%m/%d/%Y", "%Y-%m-%d")
+_last_date_fmt = [DATE_FORMATS[0]]
+
+def parse_dates(values):
+    """Parse a Date column, re-parsing only the rows the preferred format missed."""
+    preferred = _last_date_fmt[0]
+    parsed = pd.to_datetime(values, format=preferred, errors='coerce')
+    for fmt in DATE_FORMATS:
+        residual = parsed.isna() & values.notna()
+        if not residual.any():
+            break
+        if fmt == preferred:
+            continue
+        retry = pd.to_datetime(values[residual], format=fmt, errors='coerce')
+        if retry.notna().sum() > parsed.notna().sum():
+            _last_date_fmt[0] = fmt
+        parsed = parsed.fillna(retry)
+    return parsed
 
 def safe_date_str(dt):
     """Return a formatted date string if dt is valid; otherwise, return an empty string."""
     return "" if pd.isnull(dt) else dt.strftime("%Y-%m-%d")
 
-def get_date_only(dt):
-    """
-    If dt is NaT, return NaT.
-    Otherwise, if dt.time() < 07:00, subtract 1 day from dt.date().
-    (This is the simpler version without special handling for the first day.)
-    """
-    if pd.isnull(dt):
-        return pd.NaT
-    return (dt - timedelta(days=1)).date() if dt.time() < time(7, 0, 0) else dt.date()
-
-def round_if_number(x, decimals=1):
-    if isinstance(x, (int, float, np.number)):
-        return round(x, decimals)
-    return x
-
 # Mapping function using Folium
 def show_map_with_folium(latitudes, longitudes, labels=None, values=None):
     """Creates an interactive map with markers using Folium.
@@ -86,54 +109,103 @@ def show_map_with_folium(latitudes, longitudes, labels=None, values=None):
     avg_lat = np.mean(latitudes)
     avg_lon = np.mean(longitudes)
     m = folium.Map(location=[avg_lat, avg_lon], zoom_start=10)
-    def value_color(v):
-        try:
-            if v is None or v == "No Data" or np.isnan(v):
-                return "blue"
-            if v < 50:
-                return "green"
-            elif v < 70:
-                return "orange"
-            else:
-                return "red"
-        except Exception:
-            return "blue"
-
-    for i in range(len(latitudes)):
-        label = labels[i] if (labels and i < len(labels)) else f"Site {i+1}"
-        color = value_color(values[i]) if values and i < len(values) else "blue"
-        folium.CircleMarker(
-            location=[latitudes[i], longitudes[i]],
-            radius=6,
-            color=color,
-            fill=True,
-            fill_color=color,
-            popup=str(label),
-        ).add_to(m)
+    n = len(latitudes)
+    site_labels = [str(labels[i]) if (labels and i < len(labels)) else f"Site {i+1}" for i in range(n)]
+    # green below 50, orange below 70, red above; blue for missing/non-numeric values
+    marker_colors = np.full(n, "blue", dtype=object)
+    if values:
+        v = pd.to_numeric(pd.Series(values[:n]), errors="coerce").to_numpy(dtype=np.float64)
+        band_colors = np.array(["green", "orange", "red"], dtype=object)
+        marker_colors[:v.size] = np.where(np.isnan(v), "blue", band_colors[np.digitize(v, [50, 70])])
+    # All sites go to Leaflet as one FeatureCollection rather than one object per marker
+    features = [
+        {
+            "type": "Feature",
+            "geometry": {"type": "Point", "coordinates": [lon, lat]},
+            "properties": {"label": label, "color": color},
+        }
+        for lat, lon, label, color in zip(latitudes, longitudes, site_labels, marker_colors)
+    ]
+    folium.GeoJson(
+        {"type": "FeatureCollection", "features": features},
+        marker=folium.CircleMarker(radius=6, fill=True),
+        style_function=lambda f: {
+            "color": f["properties"]["color"],
+            "fillColor": f["properties"]["color"],
+        },
+        popup=folium.GeoJsonPopup(fields=["label"], labels=False),
+    ).add_to(m)
     map_file = "temp_map.html"
     m.save(map_file)
     webbrowser.open(os.path.abspath(map_file))
 
+def write_sheet(workbook, name, df, na_rep=None):
+    """
+    Writes df to a new worksheet one row at a time, as constant_memory workbooks require.
+    Missing values become na_rep (blank if None); date/time columns keep a date format.
+    """
+    ws = workbook.add_worksheet(name)
+    header_fmt = workbook.add_format({'bold': True, 'border': 1, 'align': 'center', 'valign': 'top'})
+    date_formats = {
+        datetime: workbook.add_format({'num_format': 'yyyy-mm-dd hh:mm:ss'}),
+        date: workbook.add_format({'num_format': 'yyyy-mm-dd'}),
+        time: workbook.add_format({'num_format': 'hh:mm:ss'}),
+    }
+    ws.write_row(0, 0, [str(c) for c in df.columns], header_fmt)
+    columns = {}
+    col_formats = []
+    for col in df.columns:
+        s = df[col]
+        s = s.astype(object).where(s.notna(), na_rep)
+        first = s.first_valid_index()
+        sample = s[first] if first is not None else None
+        if pd.api.types.is_datetime64_any_dtype(df[col]) and (df[col].dropna().dt.normalize() == df[col].dropna()).all():
+            # Midnight-only datetimes (e.g. Date) are shown as plain dates
+            sample = sample.date() if sample is not None else None
+        col_formats.append(next((f for t, f in date_formats.items() if isinstance(sample, t)), None))
+        columns[str(col)] = s
+    # Consecutive columns sharing a format are written with one write_row call
+    segments = []
+    for c, fmt in enumerate(col_formats):
+        if segments and segments[-1][2] is fmt:
+            segments[-1][1] = c + 1
+        else:
+            segments.append([c, c + 1, fmt])
+    rows = pd.DataFrame(columns).itertuples(index=False, name=None)
+    for r, row in enumerate(rows, start=1):
+        for start, end, fmt in segments:
+            ws.write_row(r, start, row[start:end], fmt)
+    return ws
+
 def store_to_database(summary_df):
     """
     Stores summary_df into the 'summary' table, automatically adding new columns
     (such as 'Latitude' or 'Longitude') if they don't already exist.
     """
+    if 'Date' in summary_df.columns and pd.api.types.is_datetime64_any_dtype(summary_df['Date']):
+        # Stored as 'YYYY-MM-DD' text, matching the rows already in the table
+        summary_df = summary_df.assign(Date=summary_df['Date'].dt.date)
     try:
         conn = sqlite3.connect("acoustic_data.db")
-        cursor = conn.cursor()
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='summary'")
-        result = cursor.fetchone()
-        if result:
-            cursor.execute("PRAGMA table_info(summary)")
-            existing_cols = [row[1] for row in cursor.fetchall()]  # row[1] is the column name
-            for col in summary_df.columns:
-                if col not in existing_cols:
-                    col_type = "FLOAT" if pd.api.types.is_numeric_dtype(summary_df[col]) else "TEXT"
-                    alter_sql = f"ALTER TABLE summary ADD COLUMN '{col}' {col_type};"
-                    cursor.execute(alter_sql)
-            conn.commit()
-        summary_df.to_sql("summary", conn, if_exists="append", index=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        # Schema changes and the append share one transaction
+        with conn:
+            cursor = conn.cursor()
+            cursor.execute("BEGIN")
+            cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='summary'")
+            result = cursor.fetchone()
+            if result:
+                cursor.execute("PRAGMA table_info(summary)")
+                existing_cols = {row[1] for row in cursor.fetchall()}  # row[1] is the column name
+                for col in summary_df.columns:
+                    if col not in existing_cols:
+                        col_type = "FLOAT" if pd.api.types.is_numeric_dtype(summary_df[col]) else "TEXT"
+                        cursor.execute(f"ALTER TABLE summary ADD COLUMN '{col}' {col_type};")
+            # Multi-row INSERTs, kept under SQLite's 999 bound-parameter limit
+            chunksize = max(1, 999 // max(1, len(summary_df.columns)))
+            summary_df.to_sql("summary", conn, if_exists="append", index=False,
+                              method="multi", chunksize=chunksize)
         conn.close()
         messagebox.showinfo("Database", "Data stored in the database successfully.")
     except Exception as ex:
@@ -151,7 +223,15 @@ class DataProcessorApp(tk.Tk):
         self.latest_summary = None   # Daily summary DataFrame
         self.latest_overall = None   # Overall metrics dict
         self.raw_data = None        # Full processed DataFrame
-        self.create_widgets()
+        # Jobs run one at a time; a single worker keeps them in submission order
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.create_widgets()
+
+    def on_close(self):
+        """Drop queued jobs so the worker does not keep the process alive, then close."""
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.destroy()
     
     def create_widgets(self):
         notebook = ttk.Notebook(self)
@@ -190,8 +270,8 @@ class DataProcessorApp(tk.Tk):
         btn_frame.pack(pady=10)
         browse_btn = tk.Button(btn_frame, text="Browse Input File", command=self.browse_file)
         browse_btn.pack(side="left", padx=5)
-        process_btn = tk.Button(btn_frame, text="Process Data", command=self.process_data)
-        process_btn.pack(side="left", padx=5)
+        self.process_btn = tk.Button(btn_frame, text="Process Data", command=self.process_data)
+        self.process_btn.pack(side="left", padx=5)
         self.process_output_label = tk.Label(frame, text="", fg="green")
         self.process_output_label.pack(pady=10)
     
@@ -279,8 +359,9 @@ class DataProcessorApp(tk.Tk):
         longitudes = self.latest_summary["Longitude"].dropna().tolist()
         labels = []
         if "Date" in self.latest_summary.columns:
-            labels = [row["Date"].strftime("%d/%m/%Y") if hasattr(row["Date"], 'strftime') else str(row["Date"])
-                      for _, row in self.latest_summary.iterrows()]
+            dates = self.latest_summary["Date"]
+            labels = (pd.to_datetime(dates, errors="coerce").dt.strftime("%d/%m/%Y")
+                      .fillna(dates.astype(str)).tolist())
         if not latitudes or not longitudes:
             messagebox.showwarning("Mapping", "No valid lat/lon data to plot after user entry.")
             return
@@ -290,15 +371,16 @@ class DataProcessorApp(tk.Tk):
         show_map_with_folium(latitudes, longitudes, labels, values)
 
     def plot_overlaid_levels(self):
-        if self.latest_summary is None or self.latest_summary.empty:
+        df = self.latest_summary
+        if df is None or df.empty:
             messagebox.showwarning("Graph", "Please process a file first.")
             return
-        df = self.latest_summary
+        colset = set(df.columns)
         plt.figure(figsize=(10, 6))
         plt.plot(df['Date'], df['LAeq Day'], marker='o', label='LAeq Day')
-        if 'LAmax Day' in df.columns:
+        if 'LAmax Day' in colset:
             plt.plot(df['Date'], df['LAmax Day'], marker='o', label='LAmax Day')
-        if 'LA90 Day' in df.columns:
+        if 'LA90 Day' in colset:
             plt.plot(df['Date'], df['LA90 Day'], marker='o', label='LA90 Day')
         plt.xlabel('Date')
         plt.ylabel('Sound Level (dB)')
@@ -309,11 +391,12 @@ class DataProcessorApp(tk.Tk):
         plt.show()
 
     def plot_histograms(self):
-        if self.latest_summary is None or self.latest_summary.empty:
+        df = self.latest_summary
+        if df is None or df.empty:
             messagebox.showwarning("Graph", "Please process a file first.")
             return
-        df = self.latest_summary
-        cols = [c for c in ['LAeq Day', 'LAmax Day', 'LA90 Day'] if c in df.columns]
+        colset = set(df.columns)
+        cols = [c for c in ['LAeq Day', 'LAmax Day', 'LA90 Day'] if c in colset]
         if not cols:
             messagebox.showwarning("Graph", "No suitable columns for histogram.")
             return
@@ -323,13 +406,15 @@ class DataProcessorApp(tk.Tk):
         plt.show()
 
     def plot_long_term_trend(self):
-        if self.latest_summary is None or self.latest_summary.empty:
+        df = self.latest_summary
+        if df is None or df.empty:
             messagebox.showwarning("Graph", "Please process a file first.")
             return
-        if 'Date' not in self.latest_summary.columns or 'LAeq Day' not in self.latest_summary.columns:
+        colset = set(df.columns)
+        if 'Date' not in colset or 'LAeq Day' not in colset:
             messagebox.showwarning("Graph", "Required columns missing.")
             return
-        df = self.latest_summary.sort_values('Date')
+        df = df.sort_values('Date')
         df['MA7'] = df['LAeq Day'].rolling(window=7, min_periods=1).mean()
         plt.figure(figsize=(10, 6))
         plt.plot(df['Date'], df['LAeq Day'], label='LAeq Day')
@@ -343,16 +428,17 @@ class DataProcessorApp(tk.Tk):
         plt.show()
 
     def detect_events(self):
-        if self.latest_summary is None or self.latest_summary.empty:
+        df = self.latest_summary
+        if df is None or df.empty:
             messagebox.showwarning("Events", "Please process a file first.")
             return
-        if 'LAmax Day' not in self.latest_summary.columns:
+        if 'LAmax Day' not in set(df.columns):
             messagebox.showwarning("Events", "LAmax Day column missing.")
             return
         threshold = simpledialog.askfloat("Threshold", "Enter LAmax threshold:", minvalue=0)
         if threshold is None:
             return
-        exceed = self.latest_summary[self.latest_summary['LAmax Day'] > threshold]
+        exceed = df[df['LAmax Day'] > threshold]
         if exceed.empty:
             messagebox.showinfo("Events", "No exceedances detected.")
         else:
@@ -360,14 +446,15 @@ class DataProcessorApp(tk.Tk):
             messagebox.showinfo("Events", f"Exceedances on: {dates}")
 
     def plot_octave_band(self):
-        if self.latest_summary is None or self.latest_summary.empty:
+        df = self.latest_summary
+        if df is None or df.empty:
             messagebox.showwarning("Spectrum", "Please process a file first.")
             return
-        freq_cols = [c for c in self.latest_summary.columns if 'Hz' in c]
+        freq_cols = [c for c in df.columns if 'Hz' in c]
         if not freq_cols:
             messagebox.showwarning("Spectrum", "No octave-band data found.")
             return
-        spectrum = self.latest_summary[freq_cols].mean()
+        spectrum = df[freq_cols].mean()
         plt.figure(figsize=(8, 6))
         spectrum.plot(kind='bar')
         plt.xlabel('Frequency Band (Hz)')
@@ -384,12 +471,17 @@ class DataProcessorApp(tk.Tk):
         if df.empty:
             messagebox.showwarning("Graph", "No DateTime information available.")
             return
+        # More points than the screen can show only slow matplotlib down
+        if len(df) > MAX_PLOT_POINTS:
+            step = math.ceil(len(df) / MAX_PLOT_POINTS)
+            df = df.iloc[::step]
+        colset = set(df.columns)
         plt.figure(figsize=(10, 6))
-        if 'LAeq' in df.columns:
+        if 'LAeq' in colset:
             plt.plot(df['DateTime'], df['LAeq'], label='LAeq')
-        if 'LAmax' in df.columns:
+        if 'LAmax' in colset:
             plt.plot(df['DateTime'], df['LAmax'], label='LAmax')
-        if 'LA90' in df.columns:
+        if 'LA90' in colset:
             plt.plot(df['DateTime'], df['LA90'], label='LA90')
         plt.xlabel('Date and Time')
         plt.ylabel('Sound Level (dB)')
@@ -412,281 +504,290 @@ class DataProcessorApp(tk.Tk):
     
     def process_data(self):
         """
-        Processes the data and saves an Excel file.
-        Also sets self.latest_summary (DataFrame) and self.latest_overall (dict)
-        so that generate_pdf_report() can produce a PDF with the same data.
+        Processes the selected file on a worker thread so the window stays responsive.
+        When it finishes, self.latest_summary (DataFrame) and self.latest_overall (dict)
+        are set so that generate_pdf_report() can produce a PDF with the same data,
+        and the user is offered to save the custom Excel output.
+        """
+        input_file = self.input_file
+        logging.info("Processing file: %s", input_file)
+        self.process_output_label.config(text=f"Processing {input_file}...")
+        # One job at a time; re-enabled by _on_process_done
+        self.process_btn.config(state="disabled")
+        self._run_in_background(self._do_process, input_file,
+                                on_done=lambda future: self._on_process_done(future, input_file))
+
+    def _run_in_background(self, func, *args, on_done):
+        """Run func(*args) on the worker pool and hand the future to on_done on the Tk thread."""
+        future = self.executor.submit(func, *args)
+        self._poll_future(future, on_done)
+
+    def _poll_future(self, future, on_done):
+        if future.done():
+            on_done(future)
+        else:
+            self.after(100, self._poll_future, future, on_done)
+
+    def _do_process(self, input_file):
+        """
+        Reads input_file and returns (daily_summary_df, overall_values, df).
         This version calculates LAeq, LAmax, LA90, and LAmin for both Day and Night,
         the 10th Highest Lmax and 10th Lowest L90, additional percentile levels,
         day–evening–night (Lden) and day–night (Ldn) metrics, and the standard deviation of LAeq.
+        Runs on a worker thread, so it must not touch any Tk widgets.
         """
-        try:
-            logging.info("Processing file: %s", self.input_file)
-            df = pd.read_excel(self.input_file)
-            
-            # Step 1: Parse columns
-            df['ParsedDate'] = df['Date'].apply(parse_date)
-            df['Time_str'] = df['Time'].apply(lambda t: t.strftime("%H:%M:%S") if pd.notnull(t) else "")
-            df['DateTime'] = pd.to_datetime(df['ParsedDate'].dt.strftime("%Y-%m-%d") + " " + df['Time_str'],
-                                            format="%Y-%m-%d %H:%M:%S", errors='coerce')
-            
-            def classify_period(dt):
-                if pd.isnull(dt):
-                    return ""
-                t = dt.time()
-                return "Night-time" if t >= time(23, 0, 0) or t < time(7, 0, 0) else "Daytime"
-            
-            df['Period'] = df['DateTime'].apply(classify_period)
-            df['Integrated_LAeq'] = df['LAeq'].apply(lambda x: 10 ** (x / 10) if pd.notnull(x) else np.nan)
-            df['DateOnly'] = df['DateTime'].apply(get_date_only)
-            
-            logging.info("Data parsed successfully.")
-            print("\nSample of parsed DateTime and computed DateOnly:")
-            print(df[['Date', 'Time', 'ParsedDate', 'DateTime', 'DateOnly', 'Period']].head(10))
-            
-            # Step 2: Compute daily summary (LAeq, LAmax, LA90, LAmin for Day and Night)
-            unique_dates = sorted(df['DateOnly'].dropna().unique())
-
-            # Determine which octave-band metrics exist in the input
-            has_L90_band = any(
-                c.startswith("LA90 ") or c.startswith("L90 Z ") for c in df.columns
-            )
-            octave_aliases = {
-                "LAeq": ["LAeq", "Leq Z"],
-                "LAmax": ["LAmax", "Lmax Z"],
-                "LAmin": ["LAmin", "Lmin Z"],
-            }
-            if has_L90_band:
-                octave_aliases["LA90"] = ["LA90", "L90 Z"]
-
-            daily_data = []
-            for d in unique_dates:
-                day_rows = df[(df['Period'] == "Daytime") & (df['DateOnly'] == d)]
-                night_rows = df[(df['Period'] == "Night-time") & (df['DateOnly'] == d)]
-                
-                LAeq_day = (10 * np.log10(day_rows['Integrated_LAeq'].mean())
-                            if not day_rows.empty and not day_rows['Integrated_LAeq'].dropna().empty
-                            else "No Data")
-                LAeq_night = (10 * np.log10(night_rows['Integrated_LAeq'].mean())
-                              if not night_rows.empty and not night_rows['Integrated_LAeq'].dropna().empty
-                              else "No Data")
-                
-                LAmax_day = (np.percentile(day_rows['LAmax'].dropna(), 95)
-                             if not day_rows.empty and not day_rows['LAmax'].dropna().empty
-                             else "No Data")
-                LAmax_night = (np.percentile(night_rows['LAmax'].dropna(), 95)
-                               if not night_rows.empty and not night_rows['LAmax'].dropna().empty
-                               else "No Data")
-                
-                LA90_day = (day_rows['LA90'].mode().iloc[0] if not day_rows.empty and not day_rows['LA90'].dropna().empty
-                            else "No Data")
-                LA90_night = (night_rows['LA90'].mode().iloc[0] if not night_rows.empty and not night_rows['LA90'].dropna().empty
-                              else "No Data")
-                
-                LAmin_day = (np.percentile(day_rows['LAmin'].dropna(), 5)
-                             if not day_rows.empty and not day_rows['LAmin'].dropna().empty
-                             else "No Data")
-                LAmin_night = (np.percentile(night_rows['LAmin'].dropna(), 5)
-                               if not night_rows.empty and not night_rows['LAmin'].dropna().empty
-                               else "No Data")
-
-                band_metrics = {}
-                freq_bands = OCTAVE_BANDS_Z
-
-                aliases = octave_aliases
-
-                for hz in freq_bands:
-                    for metric, prefix_list in aliases.items():
-                        candidates = [f"{p} {hz}Hz" for p in prefix_list]
-                        func = None
-                        if metric == "LAeq":
-                            func = lambda s: 10 * np.log10(np.mean(10 ** (s / 10)))
-                        elif metric == "LAmax":
-                            func = lambda s: np.percentile(s, 95)
-                        elif metric == "LA90":
-                            func = lambda s: s.mode().iloc[0]
-                        elif metric == "LAmin":
-                            func = lambda s: np.percentile(s, 5)
-
-                        col_day = next((c for c in candidates if c in day_rows.columns), None)
-                        if col_day:
-                            vals = day_rows[col_day].dropna()
-                            val_day = func(vals) if not vals.empty else "No Data"
-                        else:
-                            val_day = "No Data"
+        df = read_input_file(input_file)
+        
+        # Step 1: Parse columns
+        # Dates may be mm/dd/yyyy or ISO (yyyy-mm-dd); Excel date cells pass straight through
+        parsed_date = parse_dates(df['Date']).dt.normalize()
+        if pd.api.types.is_datetime64_any_dtype(df['Time']):
+            time_of_day = df['Time'] - df['Time'].dt.normalize()
+        else:
+            # time objects and "HH:MM:SS" strings; keep only the clock part of datetimes
+            time_of_day = pd.to_timedelta(df['Time'].astype(str).str.split().str[-1], errors='coerce')
+        df['DateTime'] = parsed_date + time_of_day
+        
+        # Classify periods from the hour of day; rows without a DateTime get ""
+        hours = df['DateTime'].dt.hour.to_numpy()
+        missing = df['DateTime'].isna().to_numpy()
+        df['Period'] = pd.Categorical(
+            np.where(missing, "", np.where((hours >= 23) | (hours < 7), "Night-time", "Daytime")),
+            categories=["", "Daytime", "Night-time"],
+        )
+        df['Period_lden'] = pd.Categorical(
+            np.select(
+                [missing, (hours >= 7) & (hours < 19), (hours >= 19) & (hours < 23)],
+                ["", "Day", "Evening"],
+                default="Night",
+            ),
+            categories=["", "Day", "Evening", "Night"],
+        )
+        day_mask = df['Period'].values == "Daytime"
+        night_mask = df['Period'].values == "Night-time"
+        laeq = df['LAeq'].to_numpy(dtype=np.float64)
+        df['Integrated_LAeq'] = np.power(10.0, laeq * 0.1)
+        # Readings before 07:00 belong to the previous day's night
+        df['DateOnly'] = df['DateTime'].where(hours >= 7, df['DateTime'] - pd.Timedelta(days=1)).dt.date
+        
+        logging.info("Data parsed successfully.")
+        print("\nSample of parsed DateTime and computed DateOnly:")
+        print(df[['Date', 'Time', 'DateTime', 'DateOnly', 'Period']].head(10))
+        
+        # Step 2: Compute daily summary (LAeq, LAmax, LA90, LAmin for Day and Night)
+        # Determine which octave-band metrics exist in the input
+        has_L90_band = any(
+            c.startswith("LA90 ") or c.startswith("L90 Z ") for c in df.columns
+        )
+        octave_aliases = {
+            "LAeq": ["LAeq", "Leq Z"],
+            "LAmax": ["LAmax", "Lmax Z"],
+            "LAmin": ["LAmin", "Lmin Z"],
+        }
+        if has_L90_band:
+            octave_aliases["LA90"] = ["LA90", "L90 Z"]
 
-                        col_night = next((c for c in candidates if c in night_rows.columns), None)
-                        if col_night:
-                            vals = night_rows[col_night].dropna()
-                            val_night = func(vals) if not vals.empty else "No Data"
-                        else:
-                            val_night = "No Data"
+        # One grouped pass per metric instead of filtering the frame per date
+        dated = df.dropna(subset=['DateOnly'])
+        keys = [dated['DateOnly'], dated['Period']]
+        grp = dated.groupby(keys, sort=True, observed=True)
 
-                        band_metrics[f"{metric} {hz}Hz Day"] = val_day
-                        band_metrics[f"{metric} {hz}Hz Night"] = val_night
+        def grouped_mode(col):
+            """Most frequent value of col per (DateOnly, Period), smallest on ties."""
+            counts = dated.groupby(keys + [dated[col]], observed=True).size()
+            counts = counts.sort_values(ascending=False, kind="stable")
+            first = ~counts.index.droplevel(2).duplicated()
+            return counts[first].reset_index(level=2).iloc[:, 0]
+        daily_stats = {
+            "LAeq": 10 * np.log10(grp['Integrated_LAeq'].mean()),
+            "LAmax": grp['LAmax'].quantile(0.95),
+            "LA90": grouped_mode('LA90'),
+            "LAmin": grp['LAmin'].quantile(0.05),
+        }
+        band_columns = []
+        for hz in OCTAVE_BANDS_Z:
+            for metric, prefix_list in octave_aliases.items():
+                band_columns += [f"{metric} {hz}Hz Day", f"{metric} {hz}Hz Night"]
+                candidates = [f"{p} {hz}Hz" for p in prefix_list]
+                col = next((c for c in candidates if c in dated.columns), None)
+                if col is None:
+                    continue
+                if metric == "LAeq":
+                    stat = 10 * np.log10((10 ** (dated[col] / 10)).groupby(keys, sort=True, observed=True).mean())
+                elif metric == "LAmax":
+                    stat = grp[col].quantile(0.95)
+                elif metric == "LA90":
+                    stat = grouped_mode(col)
+                else:
+                    stat = grp[col].quantile(0.05)
+                daily_stats[f"{metric} {hz}Hz"] = stat
 
-                day_entry = {
-                    "Date": d,
-                    "LAeq Day": LAeq_day,
-                    "LAeq Night": LAeq_night,
-                    "LAmax Day": LAmax_day,
-                    "LAmax Night": LAmax_night,
-                    "LA90 Day": LA90_day,
-                    "LA90 Night": LA90_night,
-                    "LAmin Day": LAmin_day,
-                    "LAmin Night": LAmin_night,
-                }
-                day_entry.update(band_metrics)
-                daily_data.append(day_entry)
-            daily_summary_df = pd.DataFrame(daily_data)
-            
-            # Step 3: Compute overall values
-            overall_LAeq_day = (10 * np.log10(df.loc[df['Period'] == "Daytime", "Integrated_LAeq"].mean())
-                                if not df.loc[df['Period'] == "Daytime", "Integrated_LAeq"].dropna().empty else "No Data")
-            overall_LAeq_night = (10 * np.log10(df.loc[df['Period'] == "Night-time", "Integrated_LAeq"].mean())
-                                  if not df.loc[df['Period'] == "Night-time", "Integrated_LAeq"].dropna().empty else "No Data")
-            overall_LAmax_day = (np.percentile(df.loc[df['Period'] == "Daytime", "LAmax"].dropna(), 95)
-                                 if not df.loc[df['Period'] == "Daytime", "LAmax"].dropna().empty else "No Data")
-            overall_LAmax_night = (np.percentile(df.loc[df['Period'] == "Night-time", "LAmax"].dropna(), 95)
-                                   if not df.loc[df['Period'] == "Night-time", "LAmax"].dropna().empty else "No Data")
-            overall_LA90_day = (df.loc[df['Period'] == "Daytime", "LA90"].mode().iloc[0]
-                                if not df.loc[df['Period'] == "Daytime", "LA90"].dropna().empty else "No Data")
-            overall_LA90_night = (df.loc[df['Period'] == "Night-time", "LA90"].mode().iloc[0]
-                                  if not df.loc[df['Period'] == "Night-time", "LA90"].dropna().empty else "No Data")
-            overall_LAmin_day = (np.percentile(df.loc[df['Period'] == "Daytime", "LAmin"].dropna(), 5)
-                                 if not df.loc[df['Period'] == "Daytime", "LAmin"].dropna().empty else "No Data")
-            overall_LAmin_night = (np.percentile(df.loc[df['Period'] == "Night-time", "LAmin"].dropna(), 5)
-                                   if not df.loc[df['Period'] == "Night-time", "LAmin"].dropna().empty else "No Data")
-            
-            overall_values = {
-                "Overall LAeq Day": overall_LAeq_day,
-                "Overall LAeq Night": overall_LAeq_night,
-                "Overall LAmax Day": overall_LAmax_day,
-                "Overall LAmax Night": overall_LAmax_night,
-                "Overall LA90 Day": overall_LA90_day,
-                "Overall LA90 Night": overall_LA90_night,
-                "Overall LAmin Day": overall_LAmin_day,
-                "Overall LAmin Night": overall_LAmin_night
-            }
-            
-            # -- Added Nth Highest/Lowest for Lmax & L90 --
-            day_lmax_10_highest = nth_highest(df.loc[df['Period'] == "Daytime", "LAmax"], 10)
-            night_lmax_10_highest = nth_highest(df.loc[df['Period'] == "Night-time", "LAmax"], 10)
-            day_l90_10_lowest = nth_lowest(df.loc[df['Period'] == "Daytime", "LA90"], 10)
-            night_l90_10_lowest = nth_lowest(df.loc[df['Period'] == "Night-time", "LA90"], 10)
-            
-            overall_values["10th Highest Lmax Day"] = day_lmax_10_highest if day_lmax_10_highest is not None else "No Data"
-            overall_values["10th Highest Lmax Night"] = night_lmax_10_highest if night_lmax_10_highest is not None else "No Data"
-            overall_values["10th Lowest L90 Day"] = day_l90_10_lowest if day_l90_10_lowest is not None else "No Data"
-            overall_values["10th Lowest L90 Night"] = night_l90_10_lowest if night_l90_10_lowest is not None else "No Data"
-            # -------------------------------------------
-            
-            # -- Additional Percentile Levels from LAeq --
-            day_LAeq = df.loc[df['Period'] == "Daytime", "LAeq"].dropna()
-            night_LAeq = df.loc[df['Period'] == "Night-time", "LAeq"].dropna()
-            
-            overall_L10_day = np.percentile(day_LAeq, 90) if not day_LAeq.empty else "No Data"
-            overall_L50_day = np.percentile(day_LAeq, 50) if not day_LAeq.empty else "No Data"
-            overall_L95_day = np.percentile(day_LAeq, 5) if not day_LAeq.empty else "No Data"
-            
-            overall_L10_night = np.percentile(night_LAeq, 90) if not night_LAeq.empty else "No Data"
-            overall_L50_night = np.percentile(night_LAeq, 50) if not night_LAeq.empty else "No Data"
-            overall_L95_night = np.percentile(night_LAeq, 5) if not night_LAeq.empty else "No Data"
-            
-            overall_values["Overall L10 Day"] = overall_L10_day
-            overall_values["Overall L50 Day"] = overall_L50_day
-            overall_values["Overall L95 Day"] = overall_L95_day
-            overall_values["Overall L10 Night"] = overall_L10_night
-            overall_values["Overall L50 Night"] = overall_L50_night
-            overall_values["Overall L95 Night"] = overall_L95_night
-            # -------------------------------------------
-            
-            # -- Day–Evening–Night (Lden) Calculation --
-            # Define new period classification for Lden:
-            def classify_period_lden(dt):
-                if pd.isnull(dt):
-                    return ""
-                t = dt.time()
-                if t >= time(7, 0, 0) and t < time(19, 0, 0):
-                    return "Day"
-                elif t >= time(19, 0, 0) and t < time(23, 0, 0):
-                    return "Evening"
-                else:
-                    return "Night"
-            
-            df['Period_lden'] = df['DateTime'].apply(classify_period_lden)
-            day_lden = df.loc[df['Period_lden'] == "Day", "LAeq"].dropna()
-            evening_lden = df.loc[df['Period_lden'] == "Evening", "LAeq"].dropna()
-            night_lden = df.loc[df['Period_lden'] == "Night", "LAeq"].dropna()
-            
-            if not day_lden.empty:
-                LAeq_day_lden = 10 * np.log10(day_lden.apply(lambda x: 10**(x/10)).mean())
-            else:
-                LAeq_day_lden = None
-            if not evening_lden.empty:
-                LAeq_evening_lden = 10 * np.log10(evening_lden.apply(lambda x: 10**(x/10)).mean())
-            else:
-                LAeq_evening_lden = None
-            if not night_lden.empty:
-                LAeq_night_lden = 10 * np.log10(night_lden.apply(lambda x: 10**(x/10)).mean())
-            else:
-                LAeq_night_lden = None
-            
-            if LAeq_day_lden is not None and LAeq_evening_lden is not None and LAeq_night_lden is not None:
-                Lden = 10 * np.log10((12/24)*10**(LAeq_day_lden/10) + (4/24)*10**((LAeq_evening_lden+5)/10) + (8/24)*10**((LAeq_night_lden+10)/10))
-            else:
-                Lden = "No Data"
-            overall_values["Lden (Day-Evening-Night)"] = Lden
-            # -------------------------------------------
-            
-            # -- Day–Night (Ldn) Calculation --
-            day_dn = df.loc[df['Period'] == "Daytime", "LAeq"].dropna()
-            night_dn = df.loc[df['Period'] == "Night-time", "LAeq"].dropna()
-            if not day_dn.empty:
-                LAeq_day_dn = 10 * np.log10(day_dn.apply(lambda x: 10**(x/10)).mean())
-            else:
-                LAeq_day_dn = None
-            if not night_dn.empty:
-                LAeq_night_dn = 10 * np.log10(night_dn.apply(lambda x: 10**(x/10)).mean())
-            else:
-                LAeq_night_dn = None
-            if LAeq_day_dn is not None and LAeq_night_dn is not None:
-                Ldn = 10 * np.log10((16/24)*10**(LAeq_day_dn/10) + (8/24)*10**((LAeq_night_dn+10)/10))
-            else:
-                Ldn = "No Data"
-            overall_values["Ldn (Day-Night)"] = Ldn
-            # -------------------------------------------
-            
-            # -- Statistical Spread (Standard Deviation) of LAeq --
-            overall_LAeq_std_day = np.std(day_LAeq) if not day_LAeq.empty else "No Data"
-            overall_LAeq_std_night = np.std(night_LAeq) if not night_LAeq.empty else "No Data"
-            overall_values["Overall LAeq Std Day"] = overall_LAeq_std_day
-            overall_values["Overall LAeq Std Night"] = overall_LAeq_std_night
-            # -------------------------------------------
-            
-            self.latest_overall = overall_values
-            self.latest_summary = daily_summary_df
-            self.raw_data = df
-            
-            # Step 4: Export custom Excel output
-            output_file = filedialog.asksaveasfilename(defaultextension=".xlsx",
-                                                       filetypes=[("Excel files", "*.xlsx;*.xls")],
-                                                       title="Save Custom Output as")
-            if output_file:
-                with pd.ExcelWriter(output_file, engine='xlsxwriter') as writer:
-                    daily_summary_df.to_excel(writer, sheet_name="Daily Summary", index=False)
-                    ov_df = pd.DataFrame(list(overall_values.items()), columns=["Metric", "Value"])
-                    ov_df.to_excel(writer, sheet_name="Overall Metrics", index=False)
-                    df.to_excel(writer, sheet_name="Full Data", index=False)
-                    freq_cols = [c for c in df.columns if c.endswith('Hz')]
-                    if freq_cols:
-                        df[freq_cols].to_excel(writer, sheet_name="Octave Bands", index=False)
-                messagebox.showinfo("Success", "Data processed successfully! Excel file created. You can now generate a PDF report.")
-            else:
-                messagebox.showinfo("Success", "Data processed successfully (Excel save was skipped). You can now generate a PDF report.")
-            
+        # Pivot Daytime/Night-time and assemble the summary column by column
+        wide = pd.DataFrame(daily_stats).unstack('Period')
+        period_names = {"Daytime": "Day", "Night-time": "Night"}
+        stat_columns = {
+            f"{metric} {period_names[period]}": wide[(metric, period)].to_numpy()
+            for metric, period in wide.columns
+        }
+        summary_columns = [
+            f"{metric} {period}"
+            for metric in ("LAeq", "LAmax", "LA90", "LAmin")
+            for period in ("Day", "Night")
+        ] + band_columns
+        no_values = np.full(len(wide), np.nan)
+        daily_summary_df = pd.DataFrame({
+            "Date": pd.to_datetime(wide.index).to_numpy(dtype="datetime64[ns]"),
+            **{name: stat_columns.get(name, no_values) for name in summary_columns},
+        })
+        
+        # Step 3: Compute overall values
+        def clean(col, mask):
+            """Values of col selected by mask, without NaNs."""
+            a = df[col].to_numpy(dtype=np.float64)[mask]
+            return a[~np.isnan(a)]
+
+        day_energy, night_energy = clean('Integrated_LAeq', day_mask), clean('Integrated_LAeq', night_mask)
+        day_LAmax, night_LAmax = clean('LAmax', day_mask), clean('LAmax', night_mask)
+        day_LA90, night_LA90 = clean('LA90', day_mask), clean('LA90', night_mask)
+        day_LAmin, night_LAmin = clean('LAmin', day_mask), clean('LAmin', night_mask)
+        # Reused for the percentiles and std below
+        day_LAeq, night_LAeq = clean('LAeq', day_mask), clean('LAeq', night_mask)
+
+        overall_LAeq_day = 10 * np.log10(day_energy.mean()) if day_energy.size else np.nan
+        overall_LAeq_night = 10 * np.log10(night_energy.mean()) if night_energy.size else np.nan
+        overall_LAmax_day = np.percentile(day_LAmax, 95) if day_LAmax.size else np.nan
+        overall_LAmax_night = np.percentile(night_LAmax, 95) if night_LAmax.size else np.nan
+        overall_LA90_day = array_mode(day_LA90) if day_LA90.size else np.nan
+        overall_LA90_night = array_mode(night_LA90) if night_LA90.size else np.nan
+        overall_LAmin_day = np.percentile(day_LAmin, 5) if day_LAmin.size else np.nan
+        overall_LAmin_night = np.percentile(night_LAmin, 5) if night_LAmin.size else np.nan
+        
+        overall_values = {
+            "Overall LAeq Day": overall_LAeq_day,
+            "Overall LAeq Night": overall_LAeq_night,
+            "Overall LAmax Day": overall_LAmax_day,
+            "Overall LAmax Night": overall_LAmax_night,
+            "Overall LA90 Day": overall_LA90_day,
+            "Overall LA90 Night": overall_LA90_night,
+            "Overall LAmin Day": overall_LAmin_day,
+            "Overall LAmin Night": overall_LAmin_night
+        }
+        
+        # -- Added Nth Highest/Lowest for Lmax & L90 --
+        day_lmax_10_highest = nth_highest(day_LAmax, 10)
+        night_lmax_10_highest = nth_highest(night_LAmax, 10)
+        day_l90_10_lowest = nth_lowest(day_LA90, 10)
+        night_l90_10_lowest = nth_lowest(night_LA90, 10)
+        
+        overall_values["10th Highest Lmax Day"] = day_lmax_10_highest if day_lmax_10_highest is not None else np.nan
+        overall_values["10th Highest Lmax Night"] = night_lmax_10_highest if night_lmax_10_highest is not None else np.nan
+        overall_values["10th Lowest L90 Day"] = day_l90_10_lowest if day_l90_10_lowest is not None else np.nan
+        overall_values["10th Lowest L90 Night"] = night_l90_10_lowest if night_l90_10_lowest is not None else np.nan
+        # -------------------------------------------
+        
+        # -- Additional Percentile Levels from LAeq --
+        # L10/L50/L95 in one call per period (exceeded 10/50/95% of the time)
+        if day_LAeq.size:
+            overall_L10_day, overall_L50_day, overall_L95_day = np.percentile(day_LAeq, [90, 50, 5]).tolist()
+        else:
+            overall_L10_day = overall_L50_day = overall_L95_day = np.nan
+        
+        if night_LAeq.size:
+            overall_L10_night, overall_L50_night, overall_L95_night = np.percentile(night_LAeq, [90, 50, 5]).tolist()
+        else:
+            overall_L10_night = overall_L50_night = overall_L95_night = np.nan
+        
+        overall_values["Overall L10 Day"] = overall_L10_day
+        overall_values["Overall L50 Day"] = overall_L50_day
+        overall_values["Overall L95 Day"] = overall_L95_day
+        overall_values["Overall L10 Night"] = overall_L10_night
+        overall_values["Overall L50 Night"] = overall_L50_night
+        overall_values["Overall L95 Night"] = overall_L95_night
+        # -------------------------------------------
+        
+        # -- Day–Evening–Night (Lden) Calculation --
+        # Period averages are taken directly in the linear (energy) domain
+        def lin_mean(energy):
+            return energy.mean() if energy.size else None
+
+        period_lden = df['Period_lden'].values
+        e_day = lin_mean(clean('Integrated_LAeq', period_lden == "Day"))
+        e_evening = lin_mean(clean('Integrated_LAeq', period_lden == "Evening"))
+        e_night = lin_mean(clean('Integrated_LAeq', period_lden == "Night"))
+        
+        if None not in (e_day, e_evening, e_night):
+            Lden = 10 * np.log10((12 * e_day + 4 * e_evening * EVENING_PENALTY + 8 * e_night * NIGHT_PENALTY) / 24)
+        else:
+            Lden = np.nan
+        overall_values["Lden (Day-Evening-Night)"] = Lden
+        # -------------------------------------------
+        
+        # -- Day–Night (Ldn) Calculation --
+        e_day_dn = lin_mean(day_energy)
+        e_night_dn = lin_mean(night_energy)
+        if None not in (e_day_dn, e_night_dn):
+            Ldn = 10 * np.log10((16 * e_day_dn + 8 * e_night_dn * NIGHT_PENALTY) / 24)
+        else:
+            Ldn = np.nan
+        overall_values["Ldn (Day-Night)"] = Ldn
+        # -------------------------------------------
+        
+        # -- Statistical Spread (Standard Deviation) of LAeq --
+        overall_LAeq_std_day = np.std(day_LAeq) if day_LAeq.size else np.nan
+        overall_LAeq_std_night = np.std(night_LAeq) if night_LAeq.size else np.nan
+        overall_values["Overall LAeq Std Day"] = overall_LAeq_std_day
+        overall_values["Overall LAeq Std Night"] = overall_LAeq_std_night
+        # -------------------------------------------
+        
+        return daily_summary_df, overall_values, df
+
+    def _on_process_done(self, future, input_file):
+        try:
+            daily_summary_df, overall_values, df = future.result()
         except Exception as e:
             logging.error("Processing error: %s", str(e))
+            self.process_output_label.config(text="")
+            self.process_btn.config(state="normal")
             messagebox.showerror("Processing Error", str(e))
+            return
+        self.process_btn.config(state="normal")
+        self.latest_overall = overall_values
+        self.latest_summary = daily_summary_df
+        self.raw_data = df
+        self.process_output_label.config(text=f"Processed file: {input_file}")
+
+        # Step 4: Export custom Excel output
+        output_file = filedialog.asksaveasfilename(defaultextension=".xlsx",
+                                                   filetypes=[("Excel files", "*.xlsx;*.xls")],
+                                                   title="Save Custom Output as")
+        if output_file:
+            self._run_in_background(self._export_custom_output, output_file, daily_summary_df,
+                                    overall_values, df, on_done=self._on_export_done)
+        else:
+            messagebox.showinfo("Success", "Data processed successfully (Excel save was skipped). You can now generate a PDF report.")
+
+    def _export_custom_output(self, output_file, daily_summary_df, overall_values, df):
+        workbook = xlsxwriter.Workbook(output_file, {'constant_memory': True})
+        try:
+            write_sheet(workbook, "Daily Summary", daily_summary_df, na_rep="No Data")
+            ov_df = pd.DataFrame(list(overall_values.items()), columns=["Metric", "Value"])
+            write_sheet(workbook, "Overall Metrics", ov_df, na_rep="No Data")
+            # Band columns go to their own sheet only; rows line up with Full Data
+            freq_cols = [c for c in df.columns if c.endswith('Hz')]
+            write_sheet(workbook, "Full Data", df.drop(columns=freq_cols))
+            if freq_cols:
+                write_sheet(workbook, "Octave Bands", df[freq_cols])
+        finally:
+            workbook.close()
+
+    def _on_export_done(self, future):
+        try:
+            future.result()
+        except Exception as e:
+            logging.error("Processing error: %s", str(e))
+            messagebox.showerror("Processing Error", str(e))
+            return
+        messagebox.showinfo("Success", "Data processed successfully! Excel file created. You can now generate a PDF report.")
     
     def generate_pdf_report(self):
         """
@@ -702,13 +803,22 @@ class DataProcessorApp(tk.Tk):
         if not pdf_file:
             return
         try:
-            # Round overall metrics
-            rounded_overall = {k: round_if_number(v, 1) for k, v in self.latest_overall.items()}
+            # Overall metrics as [name, value] rows; missing values are NaN until rendered here
+            overall_rows = [
+                [k, "No Data" if pd.isna(v) else f"{v:.1f}"]
+                for k, v in self.latest_overall.items()
+            ]
             
-            # Round daily summary DataFrame
+            # Daily summary with gaps shown as "No Data"; numbers are formatted in the table build
             df_rounded = self.latest_summary.copy()
-            for col in df_rounded.columns:
-                df_rounded[col] = df_rounded[col].apply(lambda x: round_if_number(x, 1))
+            numeric = df_rounded.select_dtypes(include="number")
+            df_rounded[numeric.columns] = numeric.astype(object).where(numeric.notna(), "No Data")
+            # Object columns may still hold numbers (e.g. typed-in coordinates); round those in place
+            for col in df_rounded.columns.difference(numeric.columns):
+                s = df_rounded[col]
+                if s.dtype == object:
+                    num = pd.to_numeric(s, errors='coerce').round(1)
+                    df_rounded[col] = num.where(num.notna(), s)
             
             doc = SimpleDocTemplate(pdf_file, pagesize=letter)
             styles = getSampleStyleSheet()
@@ -720,11 +830,14 @@ class DataProcessorApp(tk.Tk):
             story.append(Spacer(1, 12))
             
             # Overall Metrics
-            overall_text = "<b>Overall Metrics (rounded to 1 decimal):</b><br/>"
-            for key, value in rounded_overall.items():
-                overall_text += f"{key}: {value}<br/>"
-            overall_para = Paragraph(overall_text, styles['Normal'])
-            story.append(overall_para)
+            story.append(Paragraph("<b>Overall Metrics (rounded to 1 decimal):</b>", styles['Normal']))
+            overall_table = Table(overall_rows, hAlign='LEFT')
+            overall_table.setStyle(TableStyle([
+                ('FONTSIZE', (0,0), (-1,-1), 10),
+                ('TOPPADDING', (0,0), (-1,-1), 0),
+                ('BOTTOMPADDING', (0,0), (-1,-1), 1),
+            ]))
+            story.append(overall_table)
             story.append(Spacer(1, 12))
             
             # Daily Summary Table
@@ -732,15 +845,15 @@ class DataProcessorApp(tk.Tk):
             story.append(Spacer(1, 12))
             
             headers = list(df_rounded.columns)
-            table_data = [headers]
-            for idx, row in df_rounded.iterrows():
-                row_data = []
-                for col in headers:
-                    cell = row[col]
-                    if hasattr(cell, 'strftime'):
-                        cell = cell.strftime("%d/%m/%Y")
-                    row_data.append(str(cell))
-                table_data.append(row_data)
+            table_data = [headers] + [
+                [
+                    f"{c:.1f}" if isinstance(c, float)
+                    else c.strftime("%d/%m/%Y") if hasattr(c, 'strftime')
+                    else str(c)
+                    for c in row
+                ]
+                for row in df_rounded.itertuples(index=False, name=None)
+            ]
             
             summary_table = Table(table_data, repeatRows=1)
             summary_table.setStyle(TableStyle([
@@ -7,6 +7,12 @@ from pathlib import Path
 
 import numpy as np
 import pandas as pd
+import xlsxwriter
+
+try:
+    import numexpr as ne
+except ImportError:  # numexpr is optional; plain NumPy is used instead
+    ne = None
 import matplotlib.pyplot as plt
 import tkinter as tk
 from tkinter import filedialog, messagebox
@@ -23,41 +29,65 @@ def load_data(csv_path: str | Path) -> pd.DataFrame:
     return df
 
 
-def classify_period(ts: pd.Timestamp) -> str:
-    """Return the period of the day for a timestamp."""
-    h = ts.hour
-    if 7 <= h < 19:
-        return 'day'
-    if 19 <= h < 23:
-        return 'evening'
-    return 'night'
+# Period of the day and Lden penalty (dB) for each hour 0-23
+_PERIOD_BY_HOUR = np.array(['night'] * 7 + ['day'] * 12 + ['evening'] * 4 + ['night'], dtype=object)
+_PENALTY_BY_HOUR = np.array([10] * 7 + [0] * 12 + [5] * 4 + [10], dtype=np.float64)
 
 
-def calculate_daily_metrics(df: pd.DataFrame) -> pd.DataFrame:
-    """Calculate LAeq and Lden for each day."""
-    df = df.copy()
-@@ -46,40 +49,137 @@ def calculate_daily_metrics(df: pd.DataFrame) -> pd.DataFrame:
-        summary.append({'Date': date, 'LAeq': laeq, 'Lden': lden})
+def classify_period(ts: pd.Timestamp) -> str:
+    """Return the period of the day for a timestamp.
 
-    return pd.DataFrame(summary)
+    Kept for callers outside this module; arrays of hours should index
+    ``_PERIOD_BY_HOUR`` directly.
+    """
+    return _PERIOD_BY_HOUR[ts.hour]
 
 
-def plot_daily_levels(summary: pd.DataFrame) -> None:
-    """Plot LAeq and Lden over time."""
-    plt.figure(figsize=(8, 4))
-    plt.plot(summary['Date'], summary['LAeq'], marker='o', label='LAeq')
-    plt.plot(summary['Date'], summary['Lden'], marker='o', label='Lden')
-    plt.xlabel('Date')
-    plt.ylabel('dB(A)')
-    plt.legend()
-    plt.grid(True)
-    plt.tight_layout()
-    plt.show()
+def calculate_daily_metrics(df: pd.DataFrame) -> pd.DataFrame:
+    """Calculate LAeq and Lden for each day."""
+    hours = df['Hour'].dt.hour.to_numpy()
+    dates = pd.Index(df['Hour'].dt.date.to_numpy(), name='Date')
+    level = df['Level_dB'].to_numpy(dtype=float)
+    # Lden penalties: none by day, +5 dB in the evening, +10 dB at night
+    weight_db = _PENALTY_BY_HOUR[hours]
+    if ne is not None:
+        # One fused, multi-threaded pass per vector without NumPy's temporaries
+        e = ne.evaluate('10 ** (level / 10)')
+        e_pen = ne.evaluate('10 ** ((level + weight_db) / 10)')
+    else:
+        e = np.power(10.0, level / 10.0)
+        e_pen = np.power(10.0, (level + weight_db) / 10.0)
+    energy = pd.DataFrame({'e': e, 'e_pen': e_pen})
+
+    summary = energy.groupby(dates).agg(
+        LAeq_mean=('e', 'mean'), Lden_sum=('e_pen', 'sum')
+    ).reset_index()
+    summary['LAeq'] = 10 * np.log10(summary['LAeq_mean'])
+    summary['Lden'] = 10 * np.log10(summary['Lden_sum'] / 24)
+    return summary.drop(columns=['LAeq_mean', 'Lden_sum'])
+
+
+def plot_daily_levels(summary: pd.DataFrame, path: str | Path | None = None) -> None:
+    """Plot LAeq and Lden over time, saving the figure to ``path`` instead of showing it if given."""
+    fig, ax = plt.subplots(figsize=(8, 4))
+    ax.plot(summary['Date'], summary['LAeq'], marker='o', label='LAeq')
+    ax.plot(summary['Date'], summary['Lden'], marker='o', label='Lden')
+    ax.set_xlabel('Date')
+    ax.set_ylabel('dB(A)')
+    ax.legend()
+    ax.grid(True)
+    fig.tight_layout()
+    if path:
+        fig.savefig(path)
+        plt.close(fig)
+    else:
+        plt.show()
 
 
 def export_results(hourly: pd.DataFrame, summary: pd.DataFrame, path: str | Path) -> None:
     """Export hourly data and computed metrics to an Excel file."""
-    with pd.ExcelWriter(path) as writer:
+    # pandas writes cells column by column, so xlsxwriter's constant_memory mode can't be used here
+    with pd.ExcelWriter(path, engine='xlsxwriter') as writer:
         hourly.to_excel(writer, index=False, sheet_name='Hourly Data')
         summary.to_excel(writer, index=False, sheet_name='Daily Metrics')
 
@@ -65,8 +95,12 @@ def export_results(hourly: pd.DataFrame, summary: pd.DataFrame, path: str | Path
 def create_template(path: str | Path) -> None:
     """Create an empty spreadsheet with required columns."""
     hours = pd.date_range('00:00', '23:00', freq='1h').time
-    df = pd.DataFrame({'Hour': hours, 'Level_dB': [np.nan] * len(hours)})
-    df.to_excel(path, index=False)
+    wb = xlsxwriter.Workbook(str(path))
+    ws = wb.add_worksheet()
+    ws.write_row(0, 0, ['Hour', 'Level_dB'], wb.add_format({'bold': True, 'border': 1}))
+    for i, h in enumerate(hours, start=1):
+        ws.write_string(i, 0, h.isoformat())
+    wb.close()
 
 
 class NoiseMetricsApp(tk.Tk):
@@ -95,6 +129,9 @@ class NoiseMetricsApp(tk.Tk):
         self.fig, self.ax = plt.subplots(figsize=(6, 3))
         self.canvas = FigureCanvasTkAgg(self.fig, master=frame)
         self.canvas.get_tk_widget().pack()
+        # Created on the first plot, then updated in place on every reload
+        self._laeq_line = None
+        self._lden_line = None
 
     def _load(self) -> None:
         path = filedialog.askopenfilename(filetypes=[('CSV', '*.csv')])
@@ -125,15 +162,21 @@ class NoiseMetricsApp(tk.Tk):
 
     def _update_plot(self) -> None:
         assert self.summary is not None
-        self.ax.clear()
-        self.ax.plot(self.summary['Date'], self.summary['LAeq'], marker='o', label='LAeq')
-        self.ax.plot(self.summary['Date'], self.summary['Lden'], marker='o', label='Lden')
-        self.ax.set_xlabel('Date')
-        self.ax.set_ylabel('dB(A)')
-        self.ax.grid(True)
-        self.ax.legend()
+        dates, laeq, lden = self.summary['Date'], self.summary['LAeq'], self.summary['Lden']
+        if self._laeq_line is None:
+            self._laeq_line, = self.ax.plot(dates, laeq, marker='o', label='LAeq')
+            self._lden_line, = self.ax.plot(dates, lden, marker='o', label='Lden')
+            self.ax.set_xlabel('Date')
+            self.ax.set_ylabel('dB(A)')
+            self.ax.grid(True)
+            self.ax.legend()
+        else:
+            self._laeq_line.set_data(dates, laeq)
+            self._lden_line.set_data(dates, lden)
+            self.ax.relim()
+            self.ax.autoscale_view()
         self.fig.tight_layout()
-        self.canvas.draw()
+        self.canvas.draw_idle()
 
     def _show_summary(self) -> None:
         assert self.summary is not None
@@ -146,11 +189,11 @@ class NoiseMetricsApp(tk.Tk):
 
 def main() -> None:
     parser = argparse.ArgumentParser(description="Compute LAeq and Lden from hourly noise levels")
-    parser.add_argument('csv', help='Input CSV file with Hour and Level_dB columns')
     parser.add_argument('csv', nargs='?', help='Input CSV file with Hour and Level_dB columns')
     parser.add_argument('-o', '--output', default='noise_metrics.xlsx', help='Output Excel file')
     parser.add_argument('--template', metavar='PATH', help='Create blank template spreadsheet')
     parser.add_argument('--gui', action='store_true', help='Launch graphical interface')
+    parser.add_argument('--save-plot', metavar='PATH', help='Save the daily plot to PATH instead of showing it')
     args = parser.parse_args()
 
     if args.template:
@@ -168,7 +211,10 @@ def main() -> None:
 
     df = load_data(args.csv)
     summary = calculate_daily_metrics(df)
-    plot_daily_levels(summary)
+    if args.save_plot:
+        # Headless batch runs never open a window, so skip the GUI backend entirely
+        plt.switch_backend('Agg')
+    plot_daily_levels(summary, args.save_plot)
     export_results(df, summary, args.output)
     print(f"Results exported to {args.output}")
 
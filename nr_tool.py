@@ -10,9 +10,15 @@ saved as a PNG or PDF file.
 
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import math
+import re
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; ratings fall back to NumPy
+    njit = None
 
 # Reference NR curves for octave bands 63 Hz to 8 kHz
 NR_CURVES = {
@@ -27,6 +33,81 @@ NR_CURVES = {
 
 FREQUENCIES = ['63', '125', '250', '500', '1k', '2k', '4k', '8k']
 
+# Curve names, reference levels (curve x band) and NR numbers as arrays, in NR_CURVES order
+NR_NAMES = tuple(NR_CURVES)
+NR_REF = np.array(list(NR_CURVES.values()), dtype=np.int16)
+NR_NUMS = np.array([int(n[2:]) for n in NR_NAMES], dtype=np.int16)
+FREQ_ARR = np.array(FREQUENCIES)
+
+# Band values in a pasted line are separated by commas and/or whitespace
+_TOKEN = re.compile(r'[^,\s]+')
+
+
+def _is_numeric(parts):
+    try:
+        np.array(parts, dtype=np.float64)
+    except ValueError:
+        return False
+    return True
+
+
+# Line colours (hex, so both Tk and Matplotlib accept them)
+CONDITION_COLORS = {'Low': '#1f77b4', 'Medium': '#ff7f0e', 'High': '#2ca02c'}
+NR_COLORS = dict(zip(NR_NAMES, ['#9467bd', '#8c564b', '#e377c2', '#7f7f7f', '#bcbd22', '#17becf', '#d62728']))
+
+# Plot canvas size and the margins around the data area, in pixels
+PLOT_W, PLOT_H = 640, 320
+PLOT_LEFT, PLOT_RIGHT, PLOT_TOP, PLOT_BOTTOM = 50, 100, 15, 40
+
+# Float copies for interpolation, rows in ascending NR order
+_NR_ORDER = np.argsort(NR_NUMS)
+_NR_LEVELS = NR_NUMS[_NR_ORDER].astype(np.float64)
+_NR_MAT = NR_REF[_NR_ORDER].astype(np.float64)
+
+
+if njit is not None:
+    @njit(cache=True)
+    def _nr_rating_kernel(sets, nr_mat, nr_levels):
+        """Interpolated NR rating per set and band, scanning up to the bracketing curve pair."""
+        n_curves, n_bands = nr_mat.shape
+        out = np.empty(sets.shape)
+        for s in range(sets.shape[0]):
+            for b in range(n_bands):
+                v = sets[s, b]
+                # Stop at the last pair so levels above NR50 extrapolate from it
+                k = 0
+                while k < n_curves - 2 and nr_mat[k + 1, b] < v:
+                    k += 1
+                v1, v2 = nr_mat[k, b], nr_mat[k + 1, b]
+                out[s, b] = nr_levels[k] + (v - v1) / (v2 - v1) * (nr_levels[k + 1] - nr_levels[k])
+        return out
+
+    def _band_ratings(sets):
+        """Fractional NR rating of each octave band of every row of sets."""
+        return _nr_rating_kernel(sets, _NR_MAT, _NR_LEVELS)
+else:
+    def _band_ratings(sets):
+        """Fractional NR rating of each octave band of every row of sets."""
+        # Lower curve of the bracketing pair for every set and band at once (searchsorted,
+        # side='left'); clipping to the first/last pair extrapolates outside NR20-NR50
+        k = np.clip((_NR_MAT < sets[:, None, :]).sum(axis=1) - 1, 0, len(_NR_LEVELS) - 2)
+        bands = np.arange(sets.shape[1])
+        v1, v2 = _NR_MAT[k, bands], _NR_MAT[k + 1, bands]
+        n1, n2 = _NR_LEVELS[k], _NR_LEVELS[k + 1]
+        return n1 + (sets - v1) / (v2 - v1) * (n2 - n1)
+
+
+def _nr_ratings(sets):
+    """Fractional NR ratings and exceeded-band masks for a (sets x bands) array."""
+    sets = np.asarray(sets, dtype=np.float64).reshape(-1, len(FREQUENCIES))
+    ratings = _band_ratings(sets).max(axis=1)
+
+    # Nearest discrete NR curve above each rating, used to report which bands exceed it
+    discrete = np.clip(np.ceil(ratings / 5) * 5, 20, 50)
+    curve = np.searchsorted(_NR_LEVELS, discrete)
+    exceeded = sets > _NR_MAT[curve]
+    return ratings, exceeded
+
 
 class NRTool(tk.Tk):
     """Main application window."""
@@ -64,7 +145,7 @@ class NRTool(tk.Tk):
         ttk.Label(input_frame, text=instructions).grid(
             row=0, column=0, columnspan=2, sticky="w"
         )
-        for row, cond in enumerate(["Low", "Medium", "High"], start=1):
+        for row, cond in enumerate(CONDITION_COLORS, start=1):
             ttk.Label(input_frame, text=cond).grid(row=row, column=0, sticky="ne")
             txt = tk.Text(input_frame, width=50, height=3)
             txt.grid(row=row, column=1, padx=5, pady=2)
@@ -80,21 +161,78 @@ class NRTool(tk.Tk):
             row=0, column=1, padx=5
         )
 
-        # Text output
-        self.output = tk.Text(frm, width=80, height=10)
+        # Read-only text output (no undo stack), rewritten as one block per Generate
+        self.output = tk.Text(frm, width=80, height=10, undo=False, maxundo=0,
+                              autoseparators=False, state='disabled')
         self.output.grid(row=3, column=0, pady=5)
 
-        # Matplotlib Figure
-        self.fig, self.ax = plt.subplots(figsize=(8, 4))
-        self.canvas = FigureCanvasTkAgg(self.fig, master=frm)
-        self.canvas.get_tk_widget().grid(row=4, column=0)
-        self.ax.set_xlabel('Frequency (Hz)')
-        self.ax.set_ylabel('SPL (dB)')
-        self.ax.set_xticks(range(len(FREQUENCIES)))
-        self.ax.set_xticklabels(FREQUENCIES)
+        # Plot drawn straight onto a Tk canvas; only items tagged 'plot' change per Generate
+        self.canvas = tk.Canvas(frm, width=PLOT_W, height=PLOT_H, bg='white')
+        self.canvas.grid(row=4, column=0)
+        self._plot_series = []
+        self._draw_axes()
+
+    def _band_x(self, i):
+        """Canvas x of the i-th octave band (bands are evenly spaced)."""
+        step = (PLOT_W - PLOT_LEFT - PLOT_RIGHT) / len(FREQUENCIES)
+        return PLOT_LEFT + (i + 0.5) * step
+
+    def _draw_axes(self):
+        """Draw the frame, frequency ticks and axis titles that never change."""
+        c = self.canvas
+        bottom = PLOT_H - PLOT_BOTTOM
+        c.create_rectangle(PLOT_LEFT, PLOT_TOP, PLOT_W - PLOT_RIGHT, bottom)
+        for i, freq in enumerate(FREQUENCIES):
+            x = self._band_x(i)
+            c.create_line(x, bottom, x, bottom + 4)
+            c.create_text(x, bottom + 6, text=freq, anchor='n')
+        c.create_text((PLOT_LEFT + PLOT_W - PLOT_RIGHT) / 2, PLOT_H - 4,
+                      text='Frequency (Hz)', anchor='s')
+        c.create_text(12, (PLOT_TOP + bottom) / 2, text='SPL (dB)', angle=90)
+
+    def _draw_plot(self, series):
+        """Redraw grid, lines and legend for series of (label, values, color, dashed)."""
+        c = self.canvas
+        c.delete('plot')
+        self._plot_series = series
+        if not series:
+            return
+        bottom, right = PLOT_H - PLOT_BOTTOM, PLOT_W - PLOT_RIGHT
+        levels = np.concatenate([np.asarray(vals, dtype=np.float64) for _, vals, _, _ in series])
+        # 10 dB grid with a little headroom so points never sit on the frame
+        lo = math.floor((np.nanmin(levels) - 2) / 10) * 10
+        hi = math.ceil((np.nanmax(levels) + 2) / 10) * 10
+        y_scale = (bottom - PLOT_TOP) / (hi - lo)
+        xs = np.array([self._band_x(i) for i in range(len(FREQUENCIES))])
+
+        for level in range(lo, hi + 1, 10):
+            y = bottom - (level - lo) * y_scale
+            c.create_line(PLOT_LEFT, y, right, y, fill='#dddddd', tags='plot')
+            c.create_text(PLOT_LEFT - 4, y, text=str(level), anchor='e', tags='plot')
+        c.tag_lower('plot')
+
+        # Legend rows that fit beside the data area; the last one says how many are left out
+        legend_rows = (bottom - PLOT_TOP - 8) // 16 + 1
+        shown = len(series) if len(series) <= legend_rows else legend_rows - 1
+        for n, (label, vals, color, dashed) in enumerate(series):
+            ys = bottom - (np.asarray(vals, dtype=np.float64) - lo) * y_scale
+            # All points in one create_line call
+            c.create_line(*np.column_stack((xs, ys)).ravel().tolist(), fill=color, width=2,
+                          dash=(6, 3) if dashed else None, tags='plot')
+            if not dashed:
+                for x, y in zip(xs, ys):
+                    c.create_oval(x - 3, y - 3, x + 3, y + 3, fill=color, outline=color, tags='plot')
+            if n < shown:
+                ly = PLOT_TOP + 8 + n * 16
+                c.create_line(right + 8, ly, right + 28, ly, fill=color, width=2,
+                              dash=(6, 3) if dashed else None, tags='plot')
+                c.create_text(right + 32, ly, text=label, anchor='w', tags='plot')
+        if shown < len(series):
+            c.create_text(right + 8, PLOT_TOP + 8 + shown * 16,
+                          text=f"+{len(series) - shown} more", anchor='w', tags='plot')
 
     def _read_inputs(self):
-        """Return dictionary of condition -> list of measurement sets."""
+        """Return dictionary of condition -> (sets x bands) array of measurements."""
         data = {}
         for cond, txt in self.text_boxes.items():
             lines = [
@@ -102,19 +240,25 @@ class NRTool(tk.Tk):
                 for ln in txt.get("1.0", tk.END).splitlines()
                 if ln.strip()
             ]
-            sets = []
-            for idx, line in enumerate(lines, start=1):
-                parts = [p for p in line.replace(',', ' ').split() if p]
+            rows = [_TOKEN.findall(line) for line in lines]
+            for idx, parts in enumerate(rows, start=1):
                 if len(parts) != len(FREQUENCIES):
                     raise ValueError(
                         f"{cond} set {idx} must have {len(FREQUENCIES)} values"
                     )
-                try:
-                    sets.append([float(p) for p in parts])
-                except ValueError:
-                    raise ValueError(f"Invalid numeric value in {cond} set {idx}")
-            if not sets:
+            if not rows:
                 raise ValueError(f"No data entered for {cond}")
+            try:
+                # Every set of the condition parsed in one C-level conversion
+                sets = np.array(rows, dtype=np.float64)
+            except ValueError:
+                idx = next(i for i, parts in enumerate(rows, start=1) if not _is_numeric(parts))
+                raise ValueError(f"Invalid numeric value in {cond} set {idx}")
+            # float() also accepts "nan" and "inf", which have no NR rating
+            finite = np.isfinite(sets).all(axis=1)
+            if not finite.all():
+                idx = int(np.argmin(finite)) + 1
+                raise ValueError(f"Invalid numeric value in {cond} set {idx}")
             data[cond] = sets
         return data
 
@@ -131,96 +275,56 @@ class NRTool(tk.Tk):
             messagebox.showerror("Input Error", "Select at least one NR curve")
             return
 
-        self.ax.clear()
         results = []
-        colors = {'Low': 'tab:blue', 'Medium': 'tab:orange', 'High': 'tab:green'}
-
-        # Plot NR curves
-        for curve_name in selected_curves:
-            self.ax.plot(
-                FREQUENCIES,
-                NR_CURVES[curve_name],
-                label=curve_name,
-                linestyle='--'
-            )
-
-        # Evaluate each condition and measurement set
+        series = [
+            (name, ref, NR_COLORS[name], True)
+            for name, ref in zip(NR_NAMES, NR_REF) if name in selected_curves
+        ]
+
+        # Every set of every condition rated in one call, rows in condition order
+        ratings, exceeded = _nr_ratings(np.concatenate(list(measurements.values())))
+        row = 0
         for cond, sets in measurements.items():
             for idx, values in enumerate(sets, start=1):
                 label = f"{cond} {idx}" if len(sets) > 1 else cond
-                self.ax.plot(
-                    FREQUENCIES,
-                    values,
-                    marker='o',
-                    label=label,
-                    color=colors.get(cond, 'black')
-                )
-                rating, exceeded = self._nr_rating(values)
-                freq_text = ', '.join(exceeded) if exceeded else 'none'
-                results.append(f"{label}: NR{rating} (exceed at {freq_text})")
-
-        self.ax.legend()
-        self.ax.set_xlabel('Frequency (Hz)')
-        self.ax.set_ylabel('SPL (dB)')
-        self.ax.grid(True)
-        self.canvas.draw()
+                series.append((label, values, CONDITION_COLORS.get(cond, 'black'), False))
+                freqs = FREQ_ARR[exceeded[row]]
+                freq_text = ', '.join(freqs) if freqs.size else 'none'
+                results.append(f"{label}: NR{round(float(ratings[row]), 1)} (exceed at {freq_text})")
+                row += 1
+
+        self._draw_plot(series)
 
         report_header = (
             "NR results for BS 8233, BS EN 15251 and Planning conditions:\n"
         )
         report_block = report_header + "\n".join(results)
 
+        self.output.configure(state='normal')
         self.output.delete("1.0", tk.END)
-        self.output.insert(tk.END, report_block)
-
-    def _nr_rating(self, values):
-        """Return fractional NR rating and list of frequencies exceeding it."""
-        # Sort curves numerically so we can interpolate between adjacent curves
-        curve_items = sorted(
-            ((int(k[2:]), v) for k, v in NR_CURVES.items()),
-            key=lambda x: x[0]
-        )
-        band_ratings = []
-        for idx, measurement in enumerate(values):
-            rating_band = None
-            # Interpolate between adjacent curves if within range
-            for (n1, vals1), (n2, vals2) in zip(curve_items[:-1], curve_items[1:]):
-                v1 = vals1[idx]
-                v2 = vals2[idx]
-                if v1 <= measurement <= v2:
-                    frac = (measurement - v1) / (v2 - v1)
-                    rating_band = n1 + frac * (n2 - n1)
-                    break
-            # Extrapolate if outside the lowest or highest curves
-            if rating_band is None:
-                if measurement < curve_items[0][1][idx]:
-                    n1, v1 = curve_items[0][0], curve_items[0][1][idx]
-                    n2, v2 = curve_items[1][0], curve_items[1][1][idx]
-                    rating_band = n1 - (v1 - measurement) / (v2 - v1) * (n2 - n1)
-                else:
-                    n1, v1 = curve_items[-2][0], curve_items[-2][1][idx]
-                    n2, v2 = curve_items[-1][0], curve_items[-1][1][idx]
-                    rating_band = n2 + (measurement - v2) / (v2 - v1) * (n2 - n1)
-            band_ratings.append(rating_band)
-
-        rating = max(band_ratings)
-
-        # Identify the nearest discrete NR curve to report which bands exceed it
-        discrete = math.ceil(rating / 5) * 5
-        discrete = max(20, min(50, discrete))
-        exceeded = [
-            freq
-            for freq, m, ref in zip(FREQUENCIES, values, NR_CURVES[f"NR{discrete}"])
-            if m > ref
-        ]
-        return round(rating, 1), exceeded
+        self.output.insert("1.0", report_block)
+        self.output.configure(state='disabled')
 
     def save_plot(self):
         """Save current plot to PNG or PDF."""
         filetypes = [('PNG', '*.png'), ('PDF', '*.pdf')]
         path = filedialog.asksaveasfilename(defaultextension='.png', filetypes=filetypes)
         if path:
-            self.fig.savefig(path)
+            # One-off Matplotlib render of what the canvas shows; imported here so
+            # the window opens without paying for Matplotlib's import
+            from matplotlib.figure import Figure
+
+            fig = Figure(figsize=(8, 4))
+            ax = fig.add_subplot()
+            for label, vals, color, dashed in self._plot_series:
+                ax.plot(FREQUENCIES, vals, label=label, color=color,
+                        linestyle='--' if dashed else '-', marker=None if dashed else 'o')
+            ax.set_xlabel('Frequency (Hz)')
+            ax.set_ylabel('SPL (dB)')
+            ax.grid(True)
+            if self._plot_series:
+                ax.legend()
+            fig.savefig(path)
             messagebox.showinfo("Saved", f"Plot saved to {path}")
 
 
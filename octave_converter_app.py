@@ -1,6 +1,3 @@
-import re
-```python
-import re
 import io
 from typing import List, Tuple
 
@@ -9,7 +6,62 @@ import pandas as pd
 import streamlit as st
 import matplotlib.pyplot as plt
 
-
+try:
+    from numba import njit
+except ImportError:  # numba is optional; band summation falls back to NumPy
+    njit = None
+
+# Commas and tabs become spaces so str.split() can coalesce the separators
+_SEPARATORS = str.maketrans({",": " ", "\t": " "})
+
+# ISO nominal 1/1 octave band centre frequencies in Hz
+ISO_OCTAVES = np.array([31.5, 63, 125, 250, 500, 1000, 2000, 4000, 8000, 16000])
+
+# Band edges at f/sqrt(2) for every centre plus the top edge; each third-octave
+# frequency falls into exactly one [lower, upper) bin
+OCTAVE_BOUNDS = np.append(ISO_OCTAVES / np.sqrt(2), ISO_OCTAVES[-1] * np.sqrt(2))
+
+
+if njit is not None:
+    @njit(cache=True)
+    def _octave_levels(freqs, spl, bounds):
+        """Power-sum spl into the [lower, upper) bands of bounds in a single pass."""
+        n_bands = bounds.size - 1
+        power = np.zeros(n_bands)
+        counts = np.zeros(n_bands, dtype=np.int64)
+        for k in range(freqs.size):
+            f = freqs[k]
+            # Also skips NaN frequencies, which fail every comparison
+            if not (bounds[0] <= f < bounds[n_bands]):
+                continue
+            i = 0
+            while f >= bounds[i + 1]:
+                i += 1
+            power[i] += 10.0 ** (spl[k] * 0.1)
+            counts[i] += 1
+        # Log only the bands that received data; empty bands stay NaN
+        out = np.full(n_bands, np.nan)
+        for i in range(n_bands):
+            if counts[i] > 0:
+                out[i] = 10.0 * np.log10(power[i])
+        return out
+else:
+    def _octave_levels(freqs, spl, bounds):
+        """Power-sum spl into the [lower, upper) bands of bounds."""
+        n_bands = len(bounds) - 1
+        idx = np.searchsorted(bounds, freqs, side="right") - 1
+        valid = (idx >= 0) & (idx < n_bands)
+        pwr = np.power(10.0, spl * 0.1)
+        power = np.bincount(idx[valid], weights=pwr[valid], minlength=n_bands)
+        counts = np.bincount(idx[valid], minlength=n_bands)
+        # Log only the bands that received data; empty bands stay NaN
+        octave_spl = np.full(n_bands, np.nan)
+        np.log10(power, out=octave_spl, where=counts > 0)
+        octave_spl *= 10
+        return octave_spl
+
+
+@st.cache_data(show_spinner=False)
 def parse_pasted_data(text: str) -> Tuple[List[float], List[float]]:
     """Parse pasted text into frequency and dB lists.
 
@@ -27,9 +79,8 @@ def parse_pasted_data(text: str) -> Tuple[List[float], List[float]]:
     if len(lines) < 2:
         raise ValueError("Paste two rows: frequencies and dB values.")
 
-    sep = r"[\s,\t]+"
-    freqs = [float(f) for f in re.split(sep, lines[0]) if f]
-    values = [float(v) for v in re.split(sep, lines[1]) if v]
+    freqs = list(map(float, lines[0].translate(_SEPARATORS).split()))
+    values = list(map(float, lines[1].translate(_SEPARATORS).split()))
 
     if len(freqs) != len(values):
         raise ValueError("Number of frequencies and values must match.")
@@ -37,35 +88,20 @@ def parse_pasted_data(text: str) -> Tuple[List[float], List[float]]:
     return freqs, values
 
 
+@st.cache_data(show_spinner=False)
 def third_to_octave(freqs: List[float], values: List[float]) -> pd.DataFrame:
     """Convert 1/3 octave band data to 1/1 octave bands using power summation."""
-    iso_octaves = np.array([
-        31.5,
-        63,
-        125,
-        250,
-        500,
-        1000,
-        2000,
-        4000,
-        8000,
-        16000,
-    ])
     freqs = np.asarray(freqs, dtype=float)
     spl = np.asarray(values, dtype=float)
+    octave_spl = _octave_levels(freqs, spl, OCTAVE_BOUNDS)
+
+    return pd.DataFrame({"Frequency (Hz)": ISO_OCTAVES, "SPL (dB)": octave_spl})
 
-    octave_spl = []
-    for center in iso_octaves:
-        lower = center / np.sqrt(2)
-        upper = center * np.sqrt(2)
-        mask = (freqs >= lower) & (freqs < upper)
-        if mask.any():
-            power = np.sum(10 ** (spl[mask] / 10))
-            octave_spl.append(10 * np.log10(power))
-        else:
-            octave_spl.append(np.nan)
 
-    return pd.DataFrame({"Frequency (Hz)": iso_octaves, "SPL (dB)": octave_spl})
+def octave_positions(freqs: List[float]) -> np.ndarray:
+    """Plot x position of each frequency, in octaves with ISO band i at x = i."""
+    ref = np.flatnonzero(ISO_OCTAVES == 1000)[0]
+    return np.log2(np.asarray(freqs, dtype=float) / 1000.0) + ref
 
 
 st.title("Third-Octave to Octave Converter")
@@ -76,7 +112,11 @@ st.write(
     "es."
 )
 
-user_input = st.text_area("Paste Data", height=150)
+# The pasted text only reaches the script when Convert is pressed; later reruns
+# (e.g. the download button) reuse the cached parse and conversion
+with st.form("convert"):
+    user_input = st.text_area("Paste Data", height=150)
+    st.form_submit_button("Convert")
 
 if user_input:
     try:
@@ -97,16 +137,21 @@ if user_input:
         st.download_button("Download CSV", csv, file_name="octave_bands.csv")
 
         st.subheader("Comparison Plot")
+        # Linear axis in octaves: bars share one width and ticks carry the ISO labels
+        x_octave = np.arange(len(ISO_OCTAVES))
         fig, ax = plt.subplots(figsize=(8, 4))
-        ax.bar(df_third["Frequency (Hz)"], df_third["SPL (dB)"], width=2,
+        ax.bar(octave_positions(third_freqs), df_third["SPL (dB)"], width=0.3,
                alpha=0.5, label="Third-Octave")
-        ax.bar(df_octave["Frequency (Hz)"], df_octave["SPL (dB)"], width=30,
+        ax.bar(x_octave, df_octave["SPL (dB)"], width=0.9,
                alpha=0.5, label="1/1 Octave")
-        ax.set_xscale("log")
+        ax.set_xticks(x_octave)
+        ax.set_xticklabels([f"{f:g}" for f in ISO_OCTAVES])
         ax.set_xlabel("Frequency (Hz)")
         ax.set_ylabel("SPL (dB)")
         ax.legend()
         st.pyplot(fig)
+        # Release the figure from pyplot's registry; every rerun builds a new one
+        plt.close(fig)
 
     except Exception as exc:
         st.error(str(exc))